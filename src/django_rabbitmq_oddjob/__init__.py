@@ -2,6 +2,7 @@
 #
 # SPDX-License-Identifier: MIT
 
+from django_rabbitmq_oddjob.lanes import lane_stats
 from django_rabbitmq_oddjob.task_decorator import oddjob
 
-__all__ = ["oddjob"]
+__all__ = ["lane_stats", "oddjob"]
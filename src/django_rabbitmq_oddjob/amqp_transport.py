@@ -2,8 +2,13 @@ from __future__ import annotations
 
 import base64
 import json
+import os
+import tempfile
+import threading
+import time
 import typing
-from contextlib import contextmanager
+import uuid
+from contextlib import contextmanager, suppress
 
 from django.conf import settings
 from pika import BlockingConnection, URLParameters
@@ -27,11 +32,22 @@ class AMQPTransport:
     """
 
     DEFAULT_QUEUE_TTL = 300  # 5 minutes in seconds
+    DEFAULT_BLOB_THRESHOLD = 1024 * 1024  # 1 MiB
+    BLOB_PREFIX = "oddjob-"
+    BLOB_SUFFIX = ".json"
+    BLOB_SWEEP_INTERVAL = 60  # seconds between expired blob sweeps in each process
     NOT_FOUND = 404
 
+    _last_blob_sweep = 0.0
+    _blob_sweep_lock = threading.Lock()
+
     def __init__(self, request):
         self.rabbitmq_url = settings.ODDJOB_SETTINGS["rabbitmq_url"]
-        self.queue_ttl_ms = settings.ODDJOB_SETTINGS.get("queue_ttl", self.DEFAULT_QUEUE_TTL) * 1000  # in milliseconds
+        self.queue_ttl = settings.ODDJOB_SETTINGS.get("queue_ttl", self.DEFAULT_QUEUE_TTL)
+        self.queue_ttl_ms = self.queue_ttl * 1000  # in milliseconds
+        # results larger than the threshold are written to blob_dir (if configured) rather than published to RabbitMQ
+        self.blob_dir = settings.ODDJOB_SETTINGS.get("blob_dir")
+        self.blob_threshold = settings.ODDJOB_SETTINGS.get("blob_threshold", self.DEFAULT_BLOB_THRESHOLD)
         # eagerly resolve username to avoid DB access in other threads
         if hasattr(request, "user"):
             self.username = request.user.get_username()
@@ -52,41 +68,51 @@ class AMQPTransport:
 
         The structure of the published data is as follows:
         {
-            "r": <result_data>,
+            "r": <result_data>,  # only if the result is stored inline
+            "b": <blob_name>,  # only if the result is stored in the blob directory
             "u": <username>  # only if not public
         }
         """
-        result_data = {
-            "r": result_data,
-        }
+        queue_name = self._queue_from_token(result_token)
+        message = {}
+        if self.blob_dir:
+            # only encode up front when the result may need to be stored as a blob
+            result_json = json.dumps(result_data)
+            if len(result_json) > self.blob_threshold:
+                message["b"] = self._write_blob(result_json)
+        if "b" not in message:
+            message["r"] = result_data
         if not public and self.username:
-            result_data.update({"u": self.username})
+            message.update({"u": self.username})
 
         with self._get_channel() as channel:
-            queue_name = self._queue_from_token(result_token)
             try:
                 channel.basic_publish(
                     exchange="",
                     routing_key=queue_name,
-                    body=json.dumps(result_data),
+                    body=json.dumps(message),
                 )
             except Exception as e:
                 raise OddjobPublishResultError from e
 
-    def get_result(self, result_token: str) -> dict | None:
+    def get_result(self, result_token: str) -> dict | typing.BinaryIO | None:
         """Retrieve the result for a given result token.
 
         A result can only retrieved once. Subsequent calls with the same token will raise
         OddjobInvalidResultTokenError.
 
         Returns:
-            The result data if found and authorized, None if still waiting for a result.
+            The result data if found and authorized, None if still waiting for a result. Results stored
+            in the blob directory are returned as an open binary file of the JSON-encoded result, the
+            blob itself is deleted as soon as it's opened.
 
         Raises:
             OddjobInvalidResultTokenError: If the result token is invalid (unknown, expired or
             already consumed).
             OddjobAuthorizationError: If the current user is not authorized to access the result.
         """
+        if self.blob_dir:
+            self._maybe_delete_expired_blobs()
         with self._get_channel() as channel:
             queue_name = self._queue_from_token(result_token)
             try:
@@ -104,16 +130,14 @@ class AMQPTransport:
                 # 1. No auth required: delete queue and return result
                 # 2. Auth required, current user is the owner: delete queue and return result
                 # 3. Auth required, current user is not the owner: raise authorization error and requeue
-                if not data.get("u"):
-                    # Case 1: No auth required
-                    channel.queue_delete(queue=queue_name)
-                    return data["r"]
-                # Case 2 and 3: Auth required
-                required_username = data["u"]
-                if self.username != required_username:
+                if data.get("u") and self.username != data["u"]:
+                    # Case 3: Auth required, current user is not the owner
                     channel.basic_nack(method.delivery_tag, requeue=True)
                     raise OddjobAuthorizationError
+                # Case 1 and 2
                 channel.queue_delete(queue=queue_name)
+                if "b" in data:
+                    return self._open_blob(data["b"])
                 return data["r"]
 
     @contextmanager
@@ -124,6 +148,68 @@ class AMQPTransport:
         finally:
             connection.close()
 
+    def delete_expired_blobs(self) -> None:
+        """Delete blobs older than the queue TTL, their queues (and so their pointers) have expired.
+
+        Only files created by oddjob (named with BLOB_PREFIX) are considered, other files in the blob
+        directory are left alone.
+        """
+        cutoff = time.time() - self.queue_ttl
+        with os.scandir(self.blob_dir) as entries:
+            for entry in entries:
+                if not entry.name.startswith(self.BLOB_PREFIX):
+                    continue
+                # the blob may already have been removed by a concurrent reader or cleanup
+                with suppress(OSError):
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+
+    def _maybe_delete_expired_blobs(self) -> None:
+        """Delete expired blobs at most once every BLOB_SWEEP_INTERVAL seconds per process.
+
+        This is best-effort, failures are left for the next sweep (or the oddjob_delete_expired_blobs
+        management command) to deal with.
+        """
+        with self._blob_sweep_lock:
+            now = time.monotonic()
+            if self._last_blob_sweep and now - self._last_blob_sweep < self.BLOB_SWEEP_INTERVAL:
+                return
+            AMQPTransport._last_blob_sweep = now
+        with suppress(OSError):
+            self.delete_expired_blobs()
+
+    def _write_blob(self, result_json: str) -> str:
+        """Write the result to a new blob in the blob directory, returning the blob name."""
+        self._maybe_delete_expired_blobs()
+        blob_name = self.BLOB_PREFIX + uuid.uuid4().hex + self.BLOB_SUFFIX
+        tmp_path = None
+        try:
+            # write to a temporary file first so readers never see a partially written blob
+            fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir, prefix=self.BLOB_PREFIX, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(result_json)
+            os.replace(tmp_path, os.path.join(self.blob_dir, blob_name))
+        except Exception as e:
+            if tmp_path is not None:
+                with suppress(OSError):
+                    os.remove(tmp_path)
+            raise OddjobPublishResultError from e
+        return blob_name
+
+    def _open_blob(self, blob_name: str) -> typing.BinaryIO:
+        """Open a blob for reading and delete it, the open file remains readable until closed."""
+        blob_path = os.path.join(self.blob_dir, os.path.basename(blob_name))
+        try:
+            f = open(blob_path, "rb")  # noqa: SIM115 - the caller is responsible for closing the file
+        except FileNotFoundError:
+            raise OddjobInvalidResultTokenError from None
+        except Exception as e:
+            raise OddjobGetResultError from e
+        # if this fails the blob will be cleaned up along with expired blobs
+        with suppress(OSError):
+            os.remove(blob_path)
+        return f
+
     def _token_from_queue(self, queue_name: str) -> str:
         """Generate a result token from a RabbitMQ queue name."""
         return base64.urlsafe_b64encode(queue_name.encode()).decode()
@@ -25,3 +25,9 @@ class OddjobAuthorizationError(OddjobError):
 class OddjobInvalidResultTokenError(OddjobError):
     def __init__(self):
         super().__init__("The provided oddjob result token is invalid.")
+
+
+class OddjobLaneSaturatedError(OddjobError):
+    def __init__(self, lane: str):
+        self.lane = lane
+        super().__init__(f"The oddjob lane {lane!r} is saturated, try again later.")
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import typing
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from django_rabbitmq_oddjob.exceptions import OddjobLaneSaturatedError
+
+DEFAULT_LANE = "default"
+
+
+class Lane:
+    """A bounded group of oddjob tasks sharing a concurrency limit.
+
+    Each submitted job is started in its own thread once a slot is free, both in the lane and for the
+    submitting task. Jobs that can't start immediately wait in the lane's queue and are started in
+    priority order (lowest `priority` value first, higher values wait longer, FIFO within a priority)
+    as running jobs finish. If the queue is full the job is rejected with OddjobLaneSaturatedError.
+
+    A `max_concurrency` or `max_queued` of None means unbounded.
+    """
+
+    def __init__(self, name: str, *, max_concurrency: int | None = None, max_queued: int | None = None):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._running = 0
+        self._running_by_task: dict[str, int] = {}
+        self._queued: list[tuple[int, int, _Job]] = []
+        self._rejected = 0
+        self._counter = itertools.count()
+
+    def submit(
+        self,
+        target: typing.Callable[[], typing.Any],
+        *,
+        task: str,
+        task_max_concurrency: int | None = None,
+        priority: int = 0,
+    ) -> None:
+        """Start `target` in a new thread, or queue it if the lane or task is at capacity.
+
+        Raises:
+            OddjobLaneSaturatedError: If the job can't be started and the lane's queue is full.
+        """
+        job = _Job(target=target, task=task, max_concurrency=task_max_concurrency)
+        with self._lock:
+            if self._can_start(job):
+                self._mark_started(job)
+            elif self.max_queued is not None and len(self._queued) >= self.max_queued:
+                self._rejected += 1
+                raise OddjobLaneSaturatedError(self.name)
+            else:
+                heapq.heappush(self._queued, (priority, next(self._counter), job))
+                return
+        self._start(job)
+
+    def reserve(self, *, task: str, task_max_concurrency: int | None = None, priority: int = 0) -> Reservation:
+        """Claim a running or queued slot in the lane before the job's target is known.
+
+        This lets callers check admission before doing any expensive setup for the job. The slot is
+        released once the reservation is started and its target completes, or when it's cancelled.
+
+        Raises:
+            OddjobLaneSaturatedError: If the job can't be started and the lane's queue is full.
+        """
+        reservation = Reservation()
+        self.submit(reservation._run, task=task, task_max_concurrency=task_max_concurrency, priority=priority)
+        return reservation
+
+    def stats(self) -> dict[str, int | None]:
+        with self._lock:
+            return {
+                "running": self._running,
+                "queued": len(self._queued),
+                "rejected": self._rejected,
+                "max_concurrency": self.max_concurrency,
+                "max_queued": self.max_queued,
+            }
+
+    def _can_start(self, job: _Job) -> bool:
+        if self.max_concurrency is not None and self._running >= self.max_concurrency:
+            return False
+        if job.max_concurrency is not None and self._running_by_task.get(job.task, 0) >= job.max_concurrency:
+            return False
+        return True
+
+    def _mark_started(self, job: _Job) -> None:
+        self._running += 1
+        self._running_by_task[job.task] = self._running_by_task.get(job.task, 0) + 1
+
+    def _start(self, job: _Job) -> None:
+        thread = threading.Thread(target=self._run, args=(job,))
+        thread.start()
+
+    def _run(self, job: _Job) -> None:
+        try:
+            job.target()
+        finally:
+            for next_job in self._finish(job):
+                self._start(next_job)
+
+    def _finish(self, job: _Job) -> list[_Job]:
+        """Release the slots held by `job` and return the queued jobs that can now start."""
+        with self._lock:
+            self._running -= 1
+            self._running_by_task[job.task] -= 1
+            if not self._running_by_task[job.task]:
+                del self._running_by_task[job.task]
+
+            ready = []
+            waiting = []
+            while self._queued:
+                entry = heapq.heappop(self._queued)
+                queued_job = entry[2]
+                if self._can_start(queued_job):
+                    self._mark_started(queued_job)
+                    ready.append(queued_job)
+                else:
+                    waiting.append(entry)
+                    # nothing else can start once the lane itself is full
+                    if self.max_concurrency is not None and self._running >= self.max_concurrency:
+                        break
+            for entry in waiting:
+                heapq.heappush(self._queued, entry)
+            return ready
+
+
+class Reservation:
+    """A slot in a lane whose target is supplied later, see Lane.reserve."""
+
+    def __init__(self):
+        self._ready = threading.Event()
+        self._target: typing.Callable[[], typing.Any] | None = None
+
+    def start(self, target: typing.Callable[[], typing.Any]) -> None:
+        self._target = target
+        self._ready.set()
+
+    def cancel(self) -> None:
+        self._ready.set()
+
+    def _run(self) -> None:
+        # runs in the lane's thread once a slot is free, which may be before the target is supplied
+        self._ready.wait()
+        if self._target is not None:
+            self._target()
+
+
+class _Job(typing.NamedTuple):
+    target: typing.Callable[[], typing.Any]
+    task: str
+    max_concurrency: int | None
+
+
+_lanes: dict[str, Lane] = {}
+_lanes_lock = threading.Lock()
+
+
+def get_lane(name: str) -> Lane:
+    """Return the lane called `name`, creating it from ODDJOB_SETTINGS["lanes"] on first use."""
+    with _lanes_lock:
+        if name not in _lanes:
+            lane_settings = settings.ODDJOB_SETTINGS.get("lanes", {}).get(name, {})
+            _lanes[name] = Lane(
+                name,
+                max_concurrency=lane_settings.get("max_concurrency"),
+                max_queued=lane_settings.get("max_queued"),
+            )
+        return _lanes[name]
+
+
+@receiver(setting_changed)
+def _reset_lanes(*, setting, **_kwargs):
+    """Drop cached lanes when ODDJOB_SETTINGS changes so they're recreated with the new limits.
+
+    Jobs already running or queued in a dropped lane still run to completion.
+    """
+    if setting == "ODDJOB_SETTINGS":
+        with _lanes_lock:
+            _lanes.clear()
+
+
+def lane_stats() -> dict[str, dict[str, int | None]]:
+    """Return running, queued and rejected counts (and configured limits) for each lane in use."""
+    with _lanes_lock:
+        lanes = list(_lanes.values())
+    return {lane.name: lane.stats() for lane in lanes}
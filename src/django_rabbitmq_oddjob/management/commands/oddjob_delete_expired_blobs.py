@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from django_rabbitmq_oddjob.amqp_transport import AMQPTransport
+
+
+class Command(BaseCommand):
+    help = "Delete oddjob result blobs older than the queue TTL."
+
+    def handle(self, *args, **options):
+        if not settings.ODDJOB_SETTINGS.get("blob_dir"):
+            msg = 'ODDJOB_SETTINGS["blob_dir"] is not configured.'
+            raise CommandError(msg)
+        AMQPTransport(request=None).delete_expired_blobs()
@@ -1,10 +1,12 @@
+from __future__ import annotations
+
 import functools
-import threading
 
 from django.http import HttpRequest
 from django.urls import reverse
 
 from django_rabbitmq_oddjob.amqp_transport import AMQPTransport
+from django_rabbitmq_oddjob.lanes import DEFAULT_LANE, get_lane
 
 
 class oddjob:  # noqa N801 - class name lowercase to relfect its usage as a decorator
@@ -26,10 +28,30 @@ class oddjob:  # noqa N801 - class name lowercase to relfect its usage as a deco
 
     The `request` required keyword argument is a Django request object. An optional `public` keyword argument, if set to `True`,
     will allow the result to be read without authentication. Otherwise, only the user who created the task can read the result.
+
+    Tasks can be grouped into lanes and limited in how many copies run at once:
+
+        @oddjob(lane="interactive", max_concurrency=4, priority=0)
+        def my_task():
+            pass
+
+    Each lane has its own running/queued limits (configured via `ODDJOB_SETTINGS["lanes"]`), so a burst of one kind of
+    task can't starve another. `max_concurrency` limits the running threads for this task within its lane and `priority`
+    orders queued tasks in the lane (lowest value first, higher values wait longer). When a task can't be started or queued, `run_in_thread` raises
+    OddjobLaneSaturatedError.
     """
 
-    def __init__(self, wrapped):
+    def __new__(cls, wrapped=None, **options):
+        # called with options only, e.g. @oddjob(lane="interactive"), return a decorator that applies them
+        if wrapped is None:
+            return functools.partial(cls, **options)
+        return super().__new__(cls)
+
+    def __init__(self, wrapped, *, lane: str = DEFAULT_LANE, max_concurrency: int | None = None, priority: int = 0):
         self.wrapped = wrapped
+        self.lane = lane
+        self.max_concurrency = max_concurrency
+        self.priority = priority
         functools.update_wrapper(self, wrapped)
 
     def __call__(self, *args, **kwargs):
@@ -39,19 +61,28 @@ class oddjob:  # noqa N801 - class name lowercase to relfect its usage as a deco
         if kwargs is None:
             kwargs = {}
         transport = AMQPTransport(request)
-        result_token = transport.get_result_token()
-
-        thread = threading.Thread(
-            target=self._run,
-            kwargs={
-                "args": args,
-                "kwargs": kwargs,
-                "result_token": result_token,
-                "transport": transport,
-                "public": public,
-            },
+        # reserve a slot in the lane first so a saturated lane is rejected without touching RabbitMQ
+        reservation = get_lane(self.lane).reserve(
+            task=f"{self.__module__}.{self.__qualname__}",
+            task_max_concurrency=self.max_concurrency,
+            priority=self.priority,
+        )
+        try:
+            result_token = transport.get_result_token()
+        except Exception:
+            reservation.cancel()
+            raise
+
+        reservation.start(
+            functools.partial(
+                self._run,
+                args=args,
+                kwargs=kwargs,
+                result_token=result_token,
+                transport=transport,
+                public=public,
+            )
         )
-        thread.start()
 
         path = reverse("oddjob-result", kwargs={"result_token": result_token})
         return request.build_absolute_uri(path)
@@ -1,4 +1,4 @@
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, HttpResponse, JsonResponse
 
 from django_rabbitmq_oddjob.amqp_transport import AMQPTransport
 from django_rabbitmq_oddjob.exceptions import OddjobAuthorizationError, OddjobInvalidResultTokenError
@@ -19,6 +19,12 @@ def result(request, result_token):
     except (OddjobAuthorizationError, OddjobInvalidResultTokenError):
         return HttpResponse(status=404)
 
+    if hasattr(result, "read"):
+        # large results are stored as blobs, stream them rather than loading them into memory
+        response = FileResponse(result, content_type="application/json")
+        # FileResponse derives this from the blob's file name, inline results don't send it
+        del response["Content-Disposition"]
+        return response
     if result:
         return JsonResponse(result)
     # NB it's not obvious, but we return a 204 to unauthorized users while the task is still pending.
@@ -1,10 +1,17 @@
 import base64
+import json
+import os
+import time
 
 import pytest
 from pika.adapters.blocking_connection import BlockingChannel
 
 from django_rabbitmq_oddjob.amqp_transport import AMQPTransport
-from django_rabbitmq_oddjob.exceptions import OddjobAuthorizationError, OddjobInvalidResultTokenError
+from django_rabbitmq_oddjob.exceptions import (
+    OddjobAuthorizationError,
+    OddjobInvalidResultTokenError,
+    OddjobPublishResultError,
+)
 
 
 @pytest.fixture
@@ -94,3 +101,118 @@ def test_result_can_only_be_fetched_once(transport):
 
     with pytest.raises(OddjobInvalidResultTokenError):
         transport.get_result(token)
+
+
+@pytest.fixture
+def blob_settings(settings, tmp_path):
+    new_oddjob_settings = settings.ODDJOB_SETTINGS.copy()
+    new_oddjob_settings.update({"blob_dir": str(tmp_path), "blob_threshold": 100})
+    settings.ODDJOB_SETTINGS = new_oddjob_settings
+    return new_oddjob_settings
+
+
+def test_large_result_is_stored_as_blob_and_deleted_on_read(blob_settings, transport, tmp_path):
+    token = transport.get_result_token()
+    expected_data = {"some": "data" * 100}
+    transport.publish_result(token, expected_data)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    res = transport.get_result(token)
+    with res:
+        assert json.loads(res.read()) == expected_data
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_small_result_is_not_stored_as_blob(blob_settings, transport, tmp_path):
+    token = transport.get_result_token()
+    expected_data = {"some": "data"}
+    transport.publish_result(token, expected_data)
+    assert list(tmp_path.iterdir()) == []
+
+    res = transport.get_result(token)
+    assert res == expected_data
+
+
+def test_private_blob_result_requires_same_publisher_and_fetcher(blob_settings, transport, rf, tmp_path):
+    token = transport.get_result_token()
+    expected_data = {"some": "data" * 100}
+    transport.publish_result(token, expected_data)
+
+    anon_transport = AMQPTransport(request=rf.get("/"))
+
+    # raises for unauthorized user and leaves the blob in place
+    with pytest.raises(OddjobAuthorizationError):
+        anon_transport.get_result(token)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    res = transport.get_result(token)
+    with res:
+        assert json.loads(res.read()) == expected_data
+
+
+def _expired_blob(tmp_path, transport, name):
+    blob = tmp_path / name
+    blob.write_text("{}")
+    expired_time = time.time() - transport.queue_ttl - 1
+    os.utime(blob, (expired_time, expired_time))
+    return blob
+
+
+def test_expired_blobs_are_deleted_on_publish(blob_settings, transport, tmp_path, monkeypatch):
+    monkeypatch.setattr(AMQPTransport, "_last_blob_sweep", 0.0)
+    expired_blob = _expired_blob(tmp_path, transport, "oddjob-expired.json")
+
+    token = transport.get_result_token()
+    transport.publish_result(token, {"some": "data" * 100})
+
+    assert not expired_blob.exists()
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_expired_blobs_are_deleted_on_read(blob_settings, transport, tmp_path, monkeypatch):
+    monkeypatch.setattr(AMQPTransport, "_last_blob_sweep", 0.0)
+    expired_blob = _expired_blob(tmp_path, transport, "oddjob-expired.json")
+
+    token = transport.get_result_token()
+    assert transport.get_result(token) is None
+
+    assert not expired_blob.exists()
+
+
+def test_expired_blob_sweep_is_throttled(blob_settings, transport, tmp_path, monkeypatch):
+    monkeypatch.setattr(AMQPTransport, "_last_blob_sweep", time.monotonic())
+    expired_blob = _expired_blob(tmp_path, transport, "oddjob-expired.json")
+
+    token = transport.get_result_token()
+    transport.publish_result(token, {"some": "data" * 100})
+
+    assert expired_blob.exists()
+
+
+def test_delete_expired_blobs_ignores_other_files(blob_settings, transport, tmp_path):
+    expired_blob = _expired_blob(tmp_path, transport, "oddjob-expired.json")
+    other_file = _expired_blob(tmp_path, transport, "unrelated.json")
+
+    transport.delete_expired_blobs()
+
+    assert not expired_blob.exists()
+    assert other_file.exists()
+
+
+def test_failed_blob_write_raises_publish_error_and_cleans_up(blob_settings, transport, tmp_path, mocker):
+    mocker.patch("django_rabbitmq_oddjob.amqp_transport.os.replace", side_effect=OSError)
+
+    token = transport.get_result_token()
+    with pytest.raises(OddjobPublishResultError):
+        transport.publish_result(token, {"some": "data" * 100})
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_missing_blob_dir_raises_publish_error(blob_settings, tmp_path, settings):
+    settings.ODDJOB_SETTINGS = {**blob_settings, "blob_dir": str(tmp_path / "missing")}
+    transport = AMQPTransport(request=None)
+
+    token = transport.get_result_token()
+    with pytest.raises(OddjobPublishResultError):
+        transport.publish_result(token, {"some": "data" * 100})
@@ -1,3 +1,4 @@
+import json
 import time
 from urllib.parse import urlparse
 
@@ -101,3 +102,24 @@ def test_launch_add_task_result_can_be_made_public(client, django_user_model):
     assert user2_result_resp.status_code == 200
     expected_result = {"x": 1, "y": 2, "sum": 3}
     assert user2_result_resp.json() == expected_result
+
+
+def test_launch_add_task_large_result_is_streamed_from_blob(client, settings, tmp_path):
+    new_oddjob_settings = settings.ODDJOB_SETTINGS.copy()
+    new_oddjob_settings.update({"blob_dir": str(tmp_path), "blob_threshold": 10})
+    settings.ODDJOB_SETTINGS = new_oddjob_settings
+
+    launch_resp = client.get("/launch_add_task/?public=true")
+
+    assert launch_resp.status_code == 200
+    result_path = urlparse(launch_resp.json()["result_url"]).path
+
+    time.sleep(1)  # Wait for the background task to complete
+    result_resp = client.get(result_path)
+
+    assert result_resp.status_code == 200
+    assert result_resp["Content-Type"] == "application/json"
+    assert "Content-Disposition" not in result_resp
+    expected_result = {"x": 1, "y": 2, "sum": 3}
+    assert json.loads(b"".join(result_resp.streaming_content)) == expected_result
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,239 @@
+import threading
+
+import pytest
+from pika.adapters.blocking_connection import BlockingChannel
+
+from django_rabbitmq_oddjob import lane_stats, oddjob
+from django_rabbitmq_oddjob.exceptions import OddjobGenerateResultTokenError, OddjobLaneSaturatedError
+from django_rabbitmq_oddjob.lanes import Lane, get_lane
+
+
+def _blocking_job(release: threading.Event, started: list, name: str):
+    def job():
+        started.append(name)
+        release.wait(timeout=5)
+
+    return job
+
+
+def _wait_for_idle(lane: Lane):
+    for _ in range(500):
+        stats = lane.stats()
+        if not stats["running"] and not stats["queued"]:
+            return
+        threading.Event().wait(0.01)
+    pytest.fail("lane did not become idle")
+
+
+def _wait_for_started(started: list, count: int):
+    for _ in range(500):
+        if len(started) >= count:
+            return
+        threading.Event().wait(0.01)
+    pytest.fail("jobs did not start")
+
+
+def test_lane_queues_jobs_beyond_max_concurrency():
+    lane = Lane("test", max_concurrency=1)
+    release = threading.Event()
+    started = []
+
+    lane.submit(_blocking_job(release, started, "first"), task="task")
+    lane.submit(_blocking_job(release, started, "second"), task="task")
+
+    assert lane.stats()["running"] == 1
+    assert lane.stats()["queued"] == 1
+
+    release.set()
+    _wait_for_idle(lane)
+    assert started == ["first", "second"]
+
+
+def test_lane_rejects_jobs_when_queue_is_full():
+    lane = Lane("test", max_concurrency=1, max_queued=1)
+    release = threading.Event()
+    started = []
+
+    lane.submit(_blocking_job(release, started, "first"), task="task")
+    lane.submit(_blocking_job(release, started, "second"), task="task")
+    with pytest.raises(OddjobLaneSaturatedError):
+        lane.submit(_blocking_job(release, started, "third"), task="task")
+
+    assert lane.stats() == {"running": 1, "queued": 1, "rejected": 1, "max_concurrency": 1, "max_queued": 1}
+
+    release.set()
+    _wait_for_idle(lane)
+    assert started == ["first", "second"]
+
+
+def test_lane_starts_queued_jobs_in_priority_order():
+    lane = Lane("test", max_concurrency=1)
+    release = threading.Event()
+    started = []
+
+    lane.submit(_blocking_job(release, started, "first"), task="task")
+    lane.submit(_blocking_job(release, started, "low"), task="task", priority=10)
+    lane.submit(_blocking_job(release, started, "high"), task="task", priority=-10)
+    lane.submit(_blocking_job(release, started, "default"), task="task")
+
+    release.set()
+    _wait_for_idle(lane)
+    assert started == ["first", "high", "default", "low"]
+
+
+def test_task_max_concurrency_does_not_block_other_tasks_in_lane():
+    lane = Lane("test", max_concurrency=2)
+    release = threading.Event()
+    started = []
+
+    lane.submit(_blocking_job(release, started, "export-1"), task="export", task_max_concurrency=1)
+    lane.submit(_blocking_job(release, started, "export-2"), task="export", task_max_concurrency=1)
+    lane.submit(_blocking_job(release, started, "quick"), task="quick")
+
+    assert lane.stats()["running"] == 2
+    assert lane.stats()["queued"] == 1
+    _wait_for_started(started, 2)
+    assert sorted(started) == ["export-1", "quick"]
+
+    release.set()
+    _wait_for_idle(lane)
+    assert sorted(started) == ["export-1", "export-2", "quick"]
+
+
+def test_get_lane_uses_lane_settings(settings):
+    new_oddjob_settings = settings.ODDJOB_SETTINGS.copy()
+    new_oddjob_settings.update({"lanes": {"configured-lane": {"max_concurrency": 3, "max_queued": 5}}})
+    settings.ODDJOB_SETTINGS = new_oddjob_settings
+
+    lane = get_lane("configured-lane")
+
+    assert lane.max_concurrency == 3
+    assert lane.max_queued == 5
+    assert lane_stats()["configured-lane"]["max_concurrency"] == 3
+
+    # lanes are recreated when the settings change
+    new_oddjob_settings = settings.ODDJOB_SETTINGS.copy()
+    new_oddjob_settings.update({"lanes": {"configured-lane": {"max_concurrency": 1}}})
+    settings.ODDJOB_SETTINGS = new_oddjob_settings
+
+    assert lane_stats() == {}
+    lane = get_lane("configured-lane")
+    assert lane.max_concurrency == 1
+    assert lane.max_queued is None
+
+
+def test_oddjob_decorator_accepts_lane_options():
+    @oddjob(lane="interactive", max_concurrency=4, priority=1)
+    def double(x):
+        return x * 2
+
+    assert double(2) == 4
+    assert double.__name__ == "double"
+    assert double.lane == "interactive"
+    assert double.max_concurrency == 4
+    assert double.priority == 1
+
+
+def test_oddjob_decorator_options_can_be_reused():
+    export = oddjob(lane="export")
+
+    @export
+    def first():
+        return "first"
+
+    @export
+    def second():
+        return "second"
+
+    assert first() == "first"
+    assert second() == "second"
+    assert first.lane == second.lane == "export"
+
+
+@pytest.fixture
+def mock_transport(mocker):
+    transport_cls = mocker.patch("django_rabbitmq_oddjob.task_decorator.AMQPTransport")
+    transport_cls.return_value.get_result_token.return_value = "sometoken"
+    return transport_cls.return_value
+
+
+def test_run_in_thread_submits_to_task_lane(mocker, rf, mock_transport):
+    lane = Lane("interactive")
+    submit_mock = mocker.patch.object(lane, "submit")
+    get_lane_mock = mocker.patch("django_rabbitmq_oddjob.task_decorator.get_lane", return_value=lane)
+
+    @oddjob(lane="interactive", max_concurrency=4, priority=1)
+    def double(x):
+        return x * 2
+
+    result_url = double.run_in_thread(args=(2,), request=rf.get("/"))
+
+    assert result_url.endswith("/oddjob/result/sometoken/")
+    get_lane_mock.assert_called_once_with("interactive")
+    submit_mock.assert_called_once()
+    assert submit_mock.call_args.kwargs == {
+        "task": f"{double.__module__}.{double.__qualname__}",
+        "task_max_concurrency": 4,
+        "priority": 1,
+    }
+
+    # the submitted job runs the task and publishes its result
+    (job,) = submit_mock.call_args.args
+    job()
+    mock_transport.publish_result.assert_called_once_with(result_token="sometoken", result_data=4, public=False)
+
+
+def test_run_in_thread_raises_when_lane_is_saturated(mocker, rf, mock_transport):
+    lane = Lane("saturated", max_concurrency=0, max_queued=0)
+    mocker.patch("django_rabbitmq_oddjob.task_decorator.get_lane", return_value=lane)
+
+    @oddjob(lane="saturated")
+    def double(x):
+        return x * 2
+
+    with pytest.raises(OddjobLaneSaturatedError):
+        double.run_in_thread(args=(2,), request=rf.get("/"))
+
+    assert lane.stats()["rejected"] == 1
+    mock_transport.get_result_token.assert_not_called()
+    mock_transport.publish_result.assert_not_called()
+
+
+def test_rejected_run_in_thread_declares_no_queue(mocker, rf):
+    lane = Lane("saturated", max_concurrency=0, max_queued=0)
+    mocker.patch("django_rabbitmq_oddjob.task_decorator.get_lane", return_value=lane)
+    queue_declare_spy = mocker.spy(BlockingChannel, "queue_declare")
+
+    @oddjob(lane="saturated")
+    def double(x):
+        return x * 2
+
+    with pytest.raises(OddjobLaneSaturatedError):
+        double.run_in_thread(args=(2,), request=rf.get("/"))
+
+    queue_declare_spy.assert_not_called()
+
+
+def test_run_in_thread_releases_lane_slot_if_result_token_fails(mocker, rf, mock_transport):
+    lane = Lane("interactive", max_concurrency=1, max_queued=0)
+    mocker.patch("django_rabbitmq_oddjob.task_decorator.get_lane", return_value=lane)
+    mock_transport.get_result_token.side_effect = OddjobGenerateResultTokenError
+
+    @oddjob(lane="interactive")
+    def double(x):
+        return x * 2
+
+    with pytest.raises(OddjobGenerateResultTokenError):
+        double.run_in_thread(args=(2,), request=rf.get("/"))
+
+    _wait_for_idle(lane)
+    mock_transport.publish_result.assert_not_called()
+
+
+def test_cancelled_reservation_releases_slot():
+    lane = Lane("test", max_concurrency=1)
+    reservation = lane.reserve(task="task")
+    assert lane.stats()["running"] == 1
+
+    reservation.cancel()
+    _wait_for_idle(lane)